@@ -8,18 +8,22 @@ from typing import List
 
 from homeassistant.components import bluetooth
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import CONF_ADDRESS, CONF_TYPE, CONF_NAME, Platform
-from homeassistant.core import HomeAssistant
+from homeassistant.const import CONF_ADDRESS, CONF_TYPE, CONF_NAME, EVENT_HOMEASSISTANT_STOP, Platform
+from homeassistant.core import Event, HomeAssistant
 from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.exceptions import ConfigEntryNotReady
 
+from .bluetti_bt_lib.field_attributes import FIELD_ATTRIBUTES, FieldType
+
 from .const import (
+    CONF_IDLE_DISCONNECT,
     CONF_MAX_RETRIES,
     CONF_PERSISTENT_CONN,
     CONF_POLLING_INTERVAL,
     CONF_POLLING_TIMEOUT,
     CONF_USE_CONTROLS,
     DATA_COORDINATOR,
+    DATA_FIELDS,
     DATA_POLLING_RUNNING,
     DOMAIN,
     MANUFACTURER,
@@ -42,6 +46,7 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     persistent_conn = entry.data.get(CONF_PERSISTENT_CONN, False)
     polling_timeout = entry.data.get(CONF_POLLING_TIMEOUT, 45)
     max_retries = entry.data.get(CONF_MAX_RETRIES, 5)
+    idle_disconnect = entry.data.get(CONF_IDLE_DISCONNECT, 0)
 
     if address is None:
         return False
@@ -56,12 +61,28 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 
     # Create coordinator for polling
     _LOGGER.debug("Creating coordinator")
-    coordinator = PollingCoordinator(hass, address, device_name, polling_interval, persistent_conn, polling_timeout, max_retries)
+    coordinator = PollingCoordinator(hass, address, device_name, polling_interval, persistent_conn, polling_timeout, max_retries, idle_disconnect)
     await coordinator.async_config_entry_first_refresh()
+
+    async def _async_stop(_event: Event) -> None:
+        await coordinator.async_shutdown()
+
+    entry.async_on_unload(
+        hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, _async_stop)
+    )
     hass.data[DOMAIN][entry.entry_id].setdefault(DATA_COORDINATOR, coordinator)
 
+    # Collect supported fields once, so platforms don't need to scan all fields
+    bluetti_device = coordinator.reader.bluetti_device
+    device_fields = {f.name for f in bluetti_device.struct.fields}
+    fields_by_type: dict = {field_type: [] for field_type in FieldType}
+    for field_key, field_config in FIELD_ATTRIBUTES.items():
+        if field_key in device_fields:
+            fields_by_type[field_config.type].append((field_key, field_config))
+    hass.data[DOMAIN][entry.entry_id][DATA_FIELDS] = fields_by_type
+
     _LOGGER.debug("Creating entities")
-    platforms: list = PLATFORMS
+    platforms: list = list(PLATFORMS)
     if use_controls is True:
         _LOGGER.warning("You are using controls with this integration at your own risk!")
         platforms.append(Platform.SWITCH)
@@ -9,7 +9,6 @@ from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.const import (
     CONF_ADDRESS,
-    CONF_NAME,
     EntityCategory,
 )
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
@@ -18,11 +17,10 @@ from homeassistant.helpers.update_coordinator import (
     CoordinatorEntity,
 )
 
-from .bluetti_bt_lib.field_attributes import FIELD_ATTRIBUTES, FieldType
-from .bluetti_bt_lib.utils.device_builder import build_device
+from .bluetti_bt_lib.field_attributes import FieldType
 
 from . import device_info as dev_info, get_unique_id
-from .const import DATA_COORDINATOR, DOMAIN
+from .const import DATA_COORDINATOR, DATA_FIELDS, DOMAIN
 from .coordinator import PollingCoordinator
 from .utils import unique_id_loggable
 
@@ -34,7 +32,6 @@ async def async_setup_entry(
 ) -> None:
     """Setup binary_sensor entities."""
 
-    device_name = entry.data.get(CONF_NAME)
     address = entry.data.get(CONF_ADDRESS)
     if address is None:
         _LOGGER.error("Device has no address")
@@ -44,27 +41,22 @@ async def async_setup_entry(
     device_info = dev_info(entry)
 
     # Add sensors according to device_info
-    bluetti_device = build_device(address, device_name)
-
     sensors_to_add = []
-    all_fields = FIELD_ATTRIBUTES
-    for field_key, field_config in all_fields.items():
-        if bluetti_device.has_field(field_key):
-            if field_config.type == FieldType.BOOL:
-                category = None
-                if field_config.setter is True:
-                    category = EntityCategory.DIAGNOSTIC
-
-                sensors_to_add.append(
-                    BluettiBinarySensor(
-                        hass.data[DOMAIN][entry.entry_id][DATA_COORDINATOR],
-                        device_info,
-                        address,
-                        field_key,
-                        field_config.name,
-                        category=category,
-                    )
-                )
+    fields = hass.data[DOMAIN][entry.entry_id][DATA_FIELDS]
+    for field_key, field_config in fields[FieldType.BOOL]:
+        category = None
+        if field_config.setter is True:
+            category = EntityCategory.DIAGNOSTIC
+
+        sensors_to_add.append(
+            BluettiBinarySensor(
+                hass.data[DOMAIN][entry.entry_id][DATA_COORDINATOR],
+                device_info,
+                field_key,
+                field_config.name,
+                category=category,
+            )
+        )
 
     async_add_entities(sensors_to_add)
 
@@ -76,7 +68,6 @@ class BluettiBinarySensor(CoordinatorEntity, BinarySensorEntity):
         self,
         coordinator: PollingCoordinator,
         device_info: DeviceInfo,
-        address,
         response_key: str,
         name: str,
         category: EntityCategory | None = None,
@@ -86,13 +77,14 @@ class BluettiBinarySensor(CoordinatorEntity, BinarySensorEntity):
 
         self._attr_has_entity_name = True
         e_name = f"{device_info.get('name')} {name}"
-        self._address = address
         self._response_key = response_key
 
         self._attr_device_info = device_info
         self._attr_name = name
         self._attr_available = False
         self._attr_unique_id = get_unique_id(e_name)
+        self._loggable_uid = unique_id_loggable(self._attr_unique_id)
+        self._written_state: tuple | None = None
         self._attr_entity_category = category
 
     @callback
@@ -102,10 +94,10 @@ class BluettiBinarySensor(CoordinatorEntity, BinarySensorEntity):
         if self.coordinator.reader.persistent_conn and not self.coordinator.reader.client.is_connected:
             return
 
-        _LOGGER.debug("Updating state of %s", unique_id_loggable(self._attr_unique_id))
-        if not isinstance(self.coordinator.data, dict):
+        _LOGGER.debug("Updating state of %s", self._loggable_uid)
+        if not self.coordinator.data_valid:
             _LOGGER.debug(
-                "Invalid data from coordinator (binary_sensor.%s)", unique_id_loggable(self._attr_unique_id)
+                "Invalid data from coordinator (binary_sensor.%s)", self._loggable_uid
             )
             self._attr_available = False
             return
@@ -118,12 +110,17 @@ class BluettiBinarySensor(CoordinatorEntity, BinarySensorEntity):
         if not isinstance(response_data, bool):
             _LOGGER.warning(
                 "Invalid response data type from coordinator (binary_sensor.%s): %s",
-                unique_id_loggable(self._attr_unique_id),
+                self._loggable_uid,
                 response_data,
             )
             self._attr_available = False
             return
 
         self._attr_available = True
-        self._attr_is_on = self.coordinator.data[self._response_key] is True
-        self.async_write_ha_state()
+        self._attr_is_on = response_data is True
+
+        # Only write state if something changed since the last write
+        state = (self._attr_is_on, self.available)
+        if state != self._written_state:
+            self._written_state = state
+            self.async_write_ha_state()
@@ -15,6 +15,7 @@ class BluettiDevice:
         self.address = address
         self.type = type
         self.sn = sn
+        self._setter_commands: dict = {}
 
     def parse(self, address: int, data: bytes) -> dict:
         return self.struct.parse(address, data)
@@ -51,6 +52,12 @@ class BluettiDevice:
         return any(any(f.address in r for r in self.writable_ranges) for f in matches)
 
     def build_setter_command(self, field: str, value: Any):
+        # Setter commands are reused, so they are only serialized once
+        key = (field, value)
+        command = self._setter_commands.get(key)
+        if command is not None:
+            return command
+
         matches = [f for f in self.struct.fields if f.name == field]
         device_field = next(
             f for f in matches if any(f.address in r for r in self.writable_ranges)
@@ -62,4 +69,6 @@ class BluettiDevice:
         elif isinstance(device_field, BoolField):
             value = 1 if value else 0
 
-        return WriteSingleRegister(device_field.address, value)
+        command = WriteSingleRegister(device_field.address, value)
+        self._setter_commands[key] = command
+        return command
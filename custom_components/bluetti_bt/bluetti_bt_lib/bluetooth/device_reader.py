@@ -1,15 +1,16 @@
 """Device reader."""
 
 import asyncio
+from contextlib import asynccontextmanager
 import logging
-from typing import Any, Callable, List, cast
-import async_timeout
+import random
+from typing import List, cast
 from bleak import BleakClient, BleakError
 
 from ..base_devices.BluettiDevice import BluettiDevice
 from ..const import NOTIFY_UUID, RESPONSE_TIMEOUT, WRITE_UUID
 from ..exceptions import BadConnectionError, ModbusError, ParseError
-from ..utils.commands import ReadHoldingRegisters
+from ..utils.commands import ReadHoldingRegisters, merge_read_commands
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -19,25 +20,49 @@ class DeviceReader:
         self,
         bleak_client: BleakClient,
         bluetti_device: BluettiDevice,
-        future_builder_method: Callable[[], asyncio.Future[Any]],
         persistent_conn: bool = False,
         polling_timeout: int = 45,
         max_retries: int = 5,
+        idle_disconnect: int = 0,
     ) -> None:
         self.client = bleak_client
         self.bluetti_device = bluetti_device
-        self.create_future = future_builder_method
         self.persistent_conn = persistent_conn
         self.polling_timeout = polling_timeout
         self.max_retries = max_retries
+        self.idle_disconnect = idle_disconnect
+
+        # Commands are built once, adjacent registers are read with a single request
+        self._polling_commands: List[ReadHoldingRegisters] = []
+        self._pack_polling_commands: List[ReadHoldingRegisters] = []
+        self._pack_num_command: ReadHoldingRegisters | None = None
+        if bluetti_device is not None:
+            self._polling_commands = merge_read_commands(
+                bluetti_device.polling_commands
+            )
+            self._pack_polling_commands = bluetti_device.pack_polling_commands
+            self._pack_num_command = self._build_pack_num_command()
 
         self.has_notifier = False
-        self.notify_future: asyncio.Future[Any] | None = None
         self.current_command = None
-        self.notify_response = bytearray()
+        self._disconnect_task: asyncio.Task | None = None
+        # Strong references, the event loop only keeps weak ones
+        self._background_tasks: set[asyncio.Task] = set()
+        self._current_pack: int | None = None
+
+        # Reusable notification state, shared by all commands
+        self._notify_buf = bytearray(512)
+        self._notify_mv = memoryview(self._notify_buf)
+        self._notify_pos = 0
+        self._expected = 0
+        self._notify_event = asyncio.Event()
+        self._notify_result: bytes | None = None
+        self._notify_error: Exception | None = None
 
         # polling mutex to guard against switches
         self.polling_lock = asyncio.Lock()
+        # loop time until which written registers must not be read
+        self._settle_until = 0.0
 
     async def read_data(
         self, filter_registers: List[ReadHoldingRegisters] | None = None
@@ -48,22 +73,25 @@ class DeviceReader:
             _LOGGER.error("Device is None")
             return None
 
-        polling_commands = self.bluetti_device.polling_commands
-        pack_commands = self.bluetti_device.pack_polling_commands
+        polling_commands = self._polling_commands
+        pack_commands = self._pack_polling_commands
         if filter_registers is not None:
             polling_commands = filter_registers
             pack_commands = []
 
         parsed_data: dict = {}
 
-        async with self.polling_lock:
+        async with self._async_settled_lock():
+            # Reuse the connection if it is still open
+            self.cancel_idle_disconnect()
+
+            success = False
             try:
-                async with async_timeout.timeout(self.polling_timeout):
+                async with asyncio.timeout(self.polling_timeout):
                     # Reconnect if not connected
                     for attempt in range(1, self.max_retries + 1):
                         try:
-                            if not self.client.is_connected:
-                                await self.client.connect()
+                            await self.async_ensure_connected()
                             break
                         except Exception as e:
                             if attempt == self.max_retries or attempt == 1:
@@ -72,7 +100,11 @@ class DeviceReader:
                                 _LOGGER.warning(
                                     f"Connect unsucessful (attempt {attempt}): {e}. Retrying..."
                                 )
-                                await asyncio.sleep(2)
+                                # Exponential backoff with jitter
+                                await asyncio.sleep(
+                                    min(0.25 * (2 ** (attempt - 1)), 8.0)
+                                    + random.uniform(0, 0.25)
+                                )
 
                     # Attach notifier if needed
                     if not self.has_notifier:
@@ -99,16 +131,27 @@ class DeviceReader:
                     # Execute pack polling commands
                     if len(pack_commands) > 0:
                         _LOGGER.debug("Polling battery packs")
-                        for pack in range(1, self.bluetti_device.pack_num_max + 1):
-                            # Set current pack number
-                            await self._async_send_command(
-                                self.bluetti_device.build_setter_command(
-                                    "pack_num", pack
+                        pack_num_max = self.bluetti_device.pack_num_max
+
+                        # Start with the currently selected pack, saves one switch per poll
+                        first_pack = self._current_pack or 1
+                        packs = list(range(first_pack, pack_num_max + 1)) + list(
+                            range(1, first_pack)
+                        )
+                        for pack in packs:
+                            suffix = str(pack)
+
+                            # Only switch if there is more than one pack and it isn't selected yet
+                            if pack_num_max > 1 and pack != self._current_pack:
+                                # Set current pack number
+                                await self._async_send_command(
+                                    self.bluetti_device.build_setter_command(
+                                        "pack_num", pack
+                                    )
                                 )
-                            )
 
-                            # We need to wait after switching packs for the data to be available
-                            await asyncio.sleep(5)
+                                # We need to wait after switching packs for the data to be available
+                                await self._async_wait_for_pack(pack)
 
                             for command in pack_commands:
                                 # Request & parse result for each pack
@@ -131,14 +174,21 @@ class DeviceReader:
                                             pack_number,
                                             pack,
                                         )
+                                        if isinstance(pack_number, int):
+                                            # Device is on another pack, switch again next time
+                                            self._current_pack = None
                                         continue
 
+                                    self._current_pack = pack
+
                                     for key, value in parsed.items():
-                                        parsed_data.update({key + str(pack): value})
+                                        parsed_data[key + suffix] = value
 
                                 except ParseError:
                                     _LOGGER.warning("Got a parse exception...")
 
+                    success = True
+
             except TimeoutError:
                 _LOGGER.error("Polling timed out")
                 return None
@@ -146,29 +196,156 @@ class DeviceReader:
                 _LOGGER.error("Bleak error: %s", err)
                 return None
             finally:
-                # Disconnect if connection not persistant
-                if not self.persistent_conn:
-                    if self.has_notifier:
-                        await self.client.stop_notify(NOTIFY_UUID)
-                        self.has_notifier = False
-                    await self.client.disconnect()
+                await self.async_release_connection(success)
 
             return parsed_data
 
+    def settle(self, seconds: float):
+        """Keep polling off the device for some time after a write.
+
+        Reading a register before the device has applied a written value
+        might reset it.
+        """
+        loop = asyncio.get_running_loop()
+        self._settle_until = max(self._settle_until, loop.time() + seconds)
+
+    @asynccontextmanager
+    async def _async_settled_lock(self):
+        """Acquire the polling lock once written values have settled."""
+        loop = asyncio.get_running_loop()
+        while True:
+            # Wait without holding the lock, so writes aren't blocked
+            delay = self._settle_until - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            await self.polling_lock.acquire()
+            if self._settle_until <= loop.time():
+                break
+            # Another write happened meanwhile
+            self.polling_lock.release()
+        try:
+            yield
+        finally:
+            self.polling_lock.release()
+
+    async def async_ensure_connected(self):
+        """Connect if not connected, must be called with the polling lock held."""
+        if not self.client.is_connected:
+            await self.client.connect()
+            # Notifications don't survive a disconnect
+            self.has_notifier = False
+
+    def cancel_idle_disconnect(self):
+        """Cancel a pending idle disconnect, the connection is used again."""
+        if self._disconnect_task is not None:
+            self._disconnect_task.cancel()
+            self._disconnect_task = None
+
+    async def async_release_connection(self, success: bool):
+        """Done using the connection, must be called with the polling lock held.
+
+        Disconnects if the connection is not persistent. After a successful
+        use the connection is kept for idle_disconnect seconds, so the next
+        caller might reuse it.
+        """
+        if self.persistent_conn:
+            return
+        self.cancel_idle_disconnect()
+        if success and self.idle_disconnect > 0:
+            task = asyncio.create_task(self._async_delayed_disconnect())
+            self._background_tasks.add(task)
+            task.add_done_callback(self._background_tasks.discard)
+            self._disconnect_task = task
+        else:
+            await self._async_disconnect()
+
+    async def async_shutdown(self):
+        """Cancel pending work and disconnect."""
+        self.cancel_idle_disconnect()
+        async with self.polling_lock:
+            try:
+                await self._async_disconnect()
+            except Exception as err:
+                _LOGGER.debug("Error on shutdown disconnect: %s", err)
+
+    async def _async_disconnect(self):
+        """Stop notifications and disconnect."""
+        if self.has_notifier and self.client.is_connected:
+            await self.client.stop_notify(NOTIFY_UUID)
+        self.has_notifier = False
+        await self.client.disconnect()
+
+    async def _async_delayed_disconnect(self):
+        """Disconnect once the connection was idle for idle_disconnect seconds."""
+        try:
+            await asyncio.sleep(self.idle_disconnect)
+            async with self.polling_lock:
+                await self._async_disconnect()
+        except asyncio.CancelledError:
+            raise
+        except Exception as err:
+            _LOGGER.debug("Error on idle disconnect: %s", err)
+        finally:
+            # Done, nothing left to cancel
+            if self._disconnect_task is asyncio.current_task():
+                self._disconnect_task = None
+
+    async def _async_wait_for_pack(self, pack: int):
+        """Wait until the device reports the given pack, at most 5 seconds."""
+        command = self._pack_num_command
+        try:
+            async with asyncio.timeout(5):
+                while True:
+                    await asyncio.sleep(0.25)
+                    if command is None:
+                        continue
+                    try:
+                        body = command.parse_response(
+                            await self._async_send_command(command)
+                        )
+                    except ParseError:
+                        continue
+                    parsed = self.bluetti_device.parse(command.starting_address, body)
+                    if parsed.get("pack_num") == pack:
+                        return
+        except TimeoutError:
+            _LOGGER.debug("Device did not report pack %s in time", pack)
+
+    def _build_pack_num_command(self) -> ReadHoldingRegisters | None:
+        """Command reading the currently selected pack number."""
+        writable_ranges = self.bluetti_device.writable_ranges
+        for field in self.bluetti_device.struct.fields:
+            if field.name == "pack_num" and not any(
+                field.address in r for r in writable_ranges
+            ):
+                return ReadHoldingRegisters(field.address, field.size)
+        return None
+
     async def _async_send_command(self, command: ReadHoldingRegisters) -> bytes:
         """Send command and return response"""
         try:
             # Prepare to make request
             self.current_command = command
-            self.notify_future = self.create_future()
-            self.notify_response = bytearray()
+            self._expected = command.response_size()
+            if self._expected > len(self._notify_buf):
+                # Grow once, the view has to be released before resizing
+                self._notify_mv.release()
+                self._notify_buf = bytearray(self._expected)
+                self._notify_mv = memoryview(self._notify_buf)
+            self._notify_event.clear()
+            self._notify_pos = 0
+            self._notify_result = None
+            self._notify_error = None
 
             # Make request
             _LOGGER.debug("Requesting %s", command)
-            await self.client.write_gatt_char(WRITE_UUID, bytes(command))
+            await self.client.write_gatt_char(WRITE_UUID, command.wire_bytes)
 
             # Wait for response
-            res = await asyncio.wait_for(self.notify_future, timeout=RESPONSE_TIMEOUT)
+            await asyncio.wait_for(self._notify_event.wait(), timeout=RESPONSE_TIMEOUT)
+            if self._notify_error is not None:
+                raise self._notify_error
+            res = self._notify_result
 
             # Process data
             _LOGGER.debug("Got %s bytes", len(res))
@@ -195,25 +372,36 @@ class DeviceReader:
         """Handle bt data."""
 
         # Ignore notifications we don't expect
-        if self.notify_future is None or self.notify_future.done():
+        if self.current_command is None or self._notify_event.is_set():
             _LOGGER.warning("Unexpected notification")
             return
 
         # If something went wrong, we might get weird data.
         if data == b"AT+NAME?\r" or data == b"AT+ADV?\r":
-            err = BadConnectionError("Got AT+ notification")
-            self.notify_future.set_exception(err)
+            self._set_notify_error(BadConnectionError("Got AT+ notification"))
             return
 
-        # Save data
-        self.notify_response.extend(data)
-
-        if len(self.notify_response) == self.current_command.response_size():
-            if self.current_command.is_valid_response(self.notify_response):
-                self.notify_future.set_result(self.notify_response)
+        # Save data into the preallocated buffer
+        n = len(data)
+        if self._notify_pos + n > self._expected:
+            self._set_notify_error(ParseError("Response too long"))
+            return
+        self._notify_mv[self._notify_pos : self._notify_pos + n] = data
+        self._notify_pos += n
+        response = self._notify_mv[: self._notify_pos]
+
+        if self._notify_pos == self._expected:
+            if self.current_command.is_valid_response(response):
+                self._notify_result = bytes(response)
+                self._notify_event.set()
             else:
-                self.notify_future.set_exception(ParseError("Failed checksum"))
-        elif self.current_command.is_exception_response(self.notify_response):
+                self._set_notify_error(ParseError("Failed checksum"))
+        elif self.current_command.is_exception_response(response):
             # We got a MODBUS command exception
-            msg = f"MODBUS Exception {self.current_command}: {self.notify_response[2]}"
-            self.notify_future.set_exception(ModbusError(msg))
+            msg = f"MODBUS Exception {self.current_command}: {response[2]}"
+            self._set_notify_error(ModbusError(msg))
+
+    def _set_notify_error(self, err: Exception):
+        """Fail the pending command."""
+        self._notify_error = err
+        self._notify_event.set()
@@ -2,7 +2,6 @@
 
 import asyncio
 import logging
-from typing import Any, Callable
 from bleak import BleakClient
 
 from custom_components.bluetti_bt.bluetti_bt_lib.utils.commands import (
@@ -15,16 +14,13 @@ from ..bluetooth.device_reader import DeviceReader
 _LOGGER = logging.getLogger(__name__)
 
 
-async def recognize_device(
-    bleak_client: BleakClient,
-    future_builder_method: Callable[[], asyncio.Future[Any]],
-) -> str:
+async def recognize_device(bleak_client: BleakClient) -> str:
 
     # Since we don't know the type we use the base device
     bluetti_device = ProtocolV2Device("Unknown", "Unknown", "Unknown")
 
     # Create device builder
-    device_reader = DeviceReader(bleak_client, bluetti_device, future_builder_method)
+    device_reader = DeviceReader(bleak_client, bluetti_device)
 
     # Retry a few times to get data
     for _ in range(1, 50):
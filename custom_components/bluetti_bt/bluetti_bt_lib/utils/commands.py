@@ -3,10 +3,14 @@
 # Copy of https://github.com/warhammerkid/bluetti_mqtt/blob/main/bluetti_mqtt/core/commands.py
 
 import struct
+from typing import List
 import crcmod.predefined
 
 modbus_crc = crcmod.predefined.mkCrcFun("modbus")
 
+# Maximum number of registers per MODBUS read request
+MAX_READ_QUANTITY = 125
+
 
 class DeviceCommand:
     def __init__(self, function_code: int, data: bytes):
@@ -17,6 +21,7 @@ class DeviceCommand:
         self.cmd[1] = function_code
         self.cmd[2:-2] = data
         struct.pack_into("<H", self.cmd, -2, modbus_crc(self.cmd[:-2]))
+        self._wire: bytes | None = None
 
     def response_size(self) -> int:
         """Returns the expected response size in bytes"""
@@ -26,6 +31,13 @@ class DeviceCommand:
         """Provide an iter implemention so that bytes(cmd) works"""
         return iter(self.cmd)
 
+    @property
+    def wire_bytes(self) -> bytes:
+        """The serialized command, only built once"""
+        if self._wire is None:
+            self._wire = bytes(self.cmd)
+        return self._wire
+
     def is_exception_response(self, response: bytes):
         """Checks the response code to see if it's a MODBUS exception"""
         if len(response) < 2:
@@ -103,3 +115,25 @@ class WriteMultipleRegisters(DeviceCommand):
 
     def __repr__(self):
         return f"WriteMultipleRegisters(starting_address={self.starting_address}, data={self.data})"
+
+
+def merge_read_commands(
+    commands: List[ReadHoldingRegisters],
+) -> List[ReadHoldingRegisters]:
+    """Merge overlapping or adjacent register reads into fewer requests"""
+    merged: List[ReadHoldingRegisters] = []
+    for command in sorted(commands, key=lambda c: c.starting_address):
+        if len(merged) > 0:
+            prev = merged[-1]
+            prev_end = prev.starting_address + prev.quantity
+            end = max(prev_end, command.starting_address + command.quantity)
+            if (
+                command.starting_address <= prev_end
+                and end - prev.starting_address <= MAX_READ_QUANTITY
+            ):
+                merged[-1] = ReadHoldingRegisters(
+                    prev.starting_address, end - prev.starting_address
+                )
+                continue
+        merged.append(command)
+    return merged
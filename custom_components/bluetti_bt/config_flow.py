@@ -22,6 +22,7 @@ from .bluetti_bt_lib.utils.device_builder import get_type_by_bt_name
 from .bluetti_bt_lib.bluetooth.device_recognizer import recognize_device
 
 from .const import (
+    CONF_IDLE_DISCONNECT,
     CONF_MAX_RETRIES,
     CONF_PERSISTENT_CONN,
     CONF_POLLING_INTERVAL,
@@ -51,7 +52,7 @@ class BluettiConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         # Get device type if needed
         if isinstance(discovery_info.name, str) and discovery_info.name.startswith("PBOX"):
             bleak_device = BleakClient(discovery_info.device)
-            device_type = await recognize_device(bleak_device, self.hass.loop.create_future)
+            device_type = await recognize_device(bleak_device)
             _LOGGER.info("Device identified as %s", device_type)
             discovery_info.name = discovery_info.name.replace("PBOX", device_type.strip())
 
@@ -140,6 +141,10 @@ class OptionsFlowHandler(config_entries.OptionsFlow):
             if user_input[CONF_MAX_RETRIES] < 1:
                 return self.async_abort(reason="invalid_retries")
 
+            # Validate idle disconnect
+            if user_input[CONF_IDLE_DISCONNECT] < 0:
+                return self.async_abort(reason="invalid_idle_disconnect")
+
             changed = self.hass.config_entries.async_update_entry(
                 self.config_entry,
                 data={
@@ -150,6 +155,7 @@ class OptionsFlowHandler(config_entries.OptionsFlow):
                         CONF_POLLING_INTERVAL: user_input[CONF_POLLING_INTERVAL],
                         CONF_POLLING_TIMEOUT: user_input[CONF_POLLING_TIMEOUT],
                         CONF_MAX_RETRIES: user_input[CONF_MAX_RETRIES],
+                        CONF_IDLE_DISCONNECT: user_input[CONF_IDLE_DISCONNECT],
                     },
                 },
             )
@@ -166,6 +172,7 @@ class OptionsFlowHandler(config_entries.OptionsFlow):
                     CONF_POLLING_INTERVAL: user_input[CONF_POLLING_INTERVAL],
                     CONF_POLLING_TIMEOUT: user_input[CONF_POLLING_TIMEOUT],
                     CONF_MAX_RETRIES: user_input[CONF_MAX_RETRIES],
+                    CONF_IDLE_DISCONNECT: user_input[CONF_IDLE_DISCONNECT],
                 },
             )
 
@@ -193,6 +200,10 @@ class OptionsFlowHandler(config_entries.OptionsFlow):
                         CONF_MAX_RETRIES,
                         default=self.config_entry.data.get(CONF_MAX_RETRIES, 5),
                     ): int,
+                    vol.Required(
+                        CONF_IDLE_DISCONNECT,
+                        default=self.config_entry.data.get(CONF_IDLE_DISCONNECT, 0),
+                    ): int,
                 }
             ),
         )
@@ -9,8 +9,10 @@ CONF_PERSISTENT_CONN = "persistent_conn"
 CONF_POLLING_INTERVAL = "polling_interval"
 CONF_POLLING_TIMEOUT = "polling_timeout"
 CONF_MAX_RETRIES = "max_retries"
+CONF_IDLE_DISCONNECT = "idle_disconnect"
 
 DATA_COORDINATOR = "coordinator"
+DATA_FIELDS = "fields"
 DATA_POLLING_RUNNING = "polling_running"
 
 SUPPORTED_MODELS = [
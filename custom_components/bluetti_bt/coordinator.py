@@ -33,6 +33,7 @@ class PollingCoordinator(DataUpdateCoordinator):
         persistent_conn: bool,
         polling_timeout: int,
         max_retries: int,
+        idle_disconnect: int,
     ):
         """Initialize coordinator."""
         super().__init__(
@@ -42,6 +43,9 @@ class PollingCoordinator(DataUpdateCoordinator):
             update_interval=timedelta(seconds=polling_interval),
         )
 
+        # Set on every update, so entities don't need to type check the data
+        self.data_valid = False
+
         # Create client
         self.logger.debug("Creating client")
         device = bluetooth.async_ble_device_from_address(hass, address)
@@ -54,12 +58,17 @@ class PollingCoordinator(DataUpdateCoordinator):
         self.reader = DeviceReader(
             client,
             bluetti_device,
-            self.hass.loop.create_future,
             persistent_conn=persistent_conn,
             polling_timeout=polling_timeout,
             max_retries=max_retries,
+            idle_disconnect=idle_disconnect,
         )
 
+    async def async_shutdown(self) -> None:
+        """Cancel any scheduled updates and disconnect."""
+        await super().async_shutdown()
+        await self.reader.async_shutdown()
+
     async def _async_update_data(self):
         """Fetch data from API endpoint.
 
@@ -67,4 +76,6 @@ class PollingCoordinator(DataUpdateCoordinator):
         so entities can quickly look up their data.
         """
 
-        return await self.reader.read_data()
+        data = await self.reader.read_data()
+        self.data_valid = isinstance(data, dict)
+        return data
@@ -11,18 +11,16 @@ from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.const import (
     CONF_ADDRESS,
-    CONF_NAME,
     EntityCategory,
 )
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from .bluetti_bt_lib.field_attributes import FIELD_ATTRIBUTES, PACK_FIELD_ATTRIBUTES, FieldType
-from .bluetti_bt_lib.utils.device_builder import build_device
+from .bluetti_bt_lib.field_attributes import PACK_FIELD_ATTRIBUTES, FieldType
 
 from . import device_info as dev_info, get_unique_id
-from .const import DATA_COORDINATOR, DOMAIN, DIAGNOSTIC_FIELDS
+from .const import DATA_COORDINATOR, DATA_FIELDS, DOMAIN, DIAGNOSTIC_FIELDS
 from .coordinator import PollingCoordinator
 from .utils import unique_id_loggable
 
@@ -34,7 +32,6 @@ async def async_setup_entry(
 ) -> None:
     """Setup sensor entities."""
 
-    device_name = entry.data.get(CONF_NAME)
     address = entry.data.get(CONF_ADDRESS)
     if address is None:
         _LOGGER.error("Device has no address")
@@ -44,49 +41,48 @@ async def async_setup_entry(
     device_info = dev_info(entry)
 
     # Add sensors according to device_info
-    bluetti_device = build_device(address, device_name)
+    bluetti_device = hass.data[DOMAIN][entry.entry_id][DATA_COORDINATOR].reader.bluetti_device
 
     sensors_to_add = []
-    all_fields = FIELD_ATTRIBUTES
+    fields = hass.data[DOMAIN][entry.entry_id][DATA_FIELDS]
+    all_fields = fields[FieldType.NUMERIC] + fields[FieldType.ENUM]
 
     if len(bluetti_device.pack_polling_commands) > 0:
         # add pack fields for device
         _LOGGER.info("Device type(%s) pack_num_max(%s)", bluetti_device.type, bluetti_device.pack_num_max)
         for pack in range (1, bluetti_device.pack_num_max + 1):
             for name, field in PACK_FIELD_ATTRIBUTES(pack).items():
-                all_fields.update({name+str(pack): field})
-
-    for field_key, field_config in all_fields.items():
-        if bluetti_device.has_field(field_key):
-            category = None
-            if field_config.setter is True or field_key in DIAGNOSTIC_FIELDS:
-                category = EntityCategory.DIAGNOSTIC
-            if field_config.type == FieldType.NUMERIC:
-                sensors_to_add.append(
-                    BluettiSensor(
-                        hass.data[DOMAIN][entry.entry_id][DATA_COORDINATOR],
-                        device_info,
-                        address,
-                        field_key,
-                        field_config.name,
-                        field_config.unit_of_measurement,
-                        field_config.device_class,
-                        field_config.state_class,
-                        category=category,
-                    )
+                if bluetti_device.has_field(name+str(pack)):
+                    all_fields.append((name+str(pack), field))
+
+    for field_key, field_config in all_fields:
+        category = None
+        if field_config.setter is True or field_key in DIAGNOSTIC_FIELDS:
+            category = EntityCategory.DIAGNOSTIC
+        if field_config.type == FieldType.NUMERIC:
+            sensors_to_add.append(
+                BluettiSensor(
+                    hass.data[DOMAIN][entry.entry_id][DATA_COORDINATOR],
+                    device_info,
+                    field_key,
+                    field_config.name,
+                    field_config.unit_of_measurement,
+                    field_config.device_class,
+                    field_config.state_class,
+                    category=category,
                 )
-            elif field_config.type == FieldType.ENUM:
-                sensors_to_add.append(
-                    BluettiSensor(
-                        hass.data[DOMAIN][entry.entry_id][DATA_COORDINATOR],
-                        device_info,
-                        address,
-                        field_key,
-                        field_config.name,
-                        options=[o.value for o in field_config.options],
-                        category=category,
-                    )
+            )
+        elif field_config.type == FieldType.ENUM:
+            sensors_to_add.append(
+                BluettiSensor(
+                    hass.data[DOMAIN][entry.entry_id][DATA_COORDINATOR],
+                    device_info,
+                    field_key,
+                    field_config.name,
+                    options=[o.value for o in field_config.options],
+                    category=category,
                 )
+            )
 
     async_add_entities(sensors_to_add)
 
@@ -98,7 +94,6 @@ class BluettiSensor(CoordinatorEntity, SensorEntity):
         self,
         coordinator: PollingCoordinator,
         device_info: DeviceInfo,
-        address,
         response_key: str,
         name: str,
         unit_of_measurement: str | None = None,
@@ -112,13 +107,13 @@ class BluettiSensor(CoordinatorEntity, SensorEntity):
 
         self._attr_has_entity_name = True
         e_name = f"{device_info.get('name')} {name}"
-        self._address = address
         self._response_key = response_key
 
         self._attr_device_info = device_info
         self._attr_name = name
         self._attr_available = False
         self._attr_unique_id = get_unique_id(e_name)
+        self._loggable_uid = unique_id_loggable(self._attr_unique_id)
         self._attr_native_unit_of_measurement = unit_of_measurement
         self._attr_device_class = device_class
         self._attr_state_class = state_class
@@ -135,14 +130,14 @@ class BluettiSensor(CoordinatorEntity, SensorEntity):
         if self.coordinator.data is None:
             _LOGGER.warning(
                 "Data from coordinator is None. Skipping update for %s",
-                unique_id_loggable(self._attr_unique_id)
+                self._loggable_uid
             )
             return
 
-        _LOGGER.debug("Updating state of %s", unique_id_loggable(self._attr_unique_id))
-        if not isinstance(self.coordinator.data, dict):
+        _LOGGER.debug("Updating state of %s", self._loggable_uid)
+        if not self.coordinator.data_valid:
             _LOGGER.warning(
-                "Invalid data from coordinator (sensor.%s)", unique_id_loggable(self._attr_unique_id)
+                "Invalid data from coordinator (sensor.%s)", self._loggable_uid
             )
             self._attr_available = False
             return
@@ -162,7 +157,7 @@ class BluettiSensor(CoordinatorEntity, SensorEntity):
         ):
             _LOGGER.warning(
                 "Invalid response data type from coordinator (sensor.%s): %s has type %s",
-                unique_id_loggable(self._attr_unique_id),
+                self._loggable_uid,
                 response_data,
                 type(response_data),
             )
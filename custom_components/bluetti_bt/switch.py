@@ -4,7 +4,6 @@ from __future__ import annotations
 
 import asyncio
 import logging
-import async_timeout
 
 from bleak import BleakError
 
@@ -14,7 +13,6 @@ from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.const import (
     CONF_ADDRESS,
-    CONF_NAME,
     EntityCategory,
 )
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
@@ -25,23 +23,25 @@ from homeassistant.helpers.update_coordinator import (
 
 from .bluetti_bt_lib.base_devices.BluettiDevice import BluettiDevice
 from .bluetti_bt_lib.const import WRITE_UUID
-from .bluetti_bt_lib.field_attributes import FIELD_ATTRIBUTES, PACK_FIELD_ATTRIBUTES, FieldType
-from .bluetti_bt_lib.utils.device_builder import build_device
+from .bluetti_bt_lib.field_attributes import FieldType
+from .bluetti_bt_lib.utils.commands import DeviceCommand
 
 from . import device_info as dev_info, get_unique_id
-from .const import CONTROL_FIELDS, DATA_COORDINATOR, DOMAIN
+from .const import CONTROL_FIELDS, DATA_COORDINATOR, DATA_FIELDS, DOMAIN
 from .coordinator import PollingCoordinator
 from .utils import mac_loggable, unique_id_loggable
 
 _LOGGER = logging.getLogger(__name__)
 
+# Writes issued within this time share one connection
+WRITE_DEBOUNCE = 0.2
+
 
 async def async_setup_entry(
     hass: HomeAssistant, entry: ConfigEntry, async_add_entities: AddEntitiesCallback
 ) -> None:
     """Setup switch entities."""
 
-    device_name = entry.data.get(CONF_NAME)
     address = entry.data.get(CONF_ADDRESS)
     if address is None:
         _LOGGER.error("Device has no address")
@@ -51,29 +51,114 @@ async def async_setup_entry(
     device_info = dev_info(entry)
 
     # Add sensors according to device_info
-    bluetti_device = build_device(address, device_name)
+    coordinator = hass.data[DOMAIN][entry.entry_id][DATA_COORDINATOR]
+    bluetti_device = coordinator.reader.bluetti_device
+    coalescer = _WriteCoalescer(coordinator)
 
     sensors_to_add = []
-    all_fields = FIELD_ATTRIBUTES
-    for field_key, field_config in all_fields.items():
-        if bluetti_device.has_field(field_key):
-            if field_config.type == FieldType.BOOL:
-                if field_config.setter is True and field_key in CONTROL_FIELDS:
-                    sensors_to_add.append(
-                        BluettiSwitch(
-                            bluetti_device,
-                            hass.data[DOMAIN][entry.entry_id][DATA_COORDINATOR],
-                            device_info,
-                            address,
-                            field_key,
-                            field_config.name,
-                            entry.entry_id
-                        )
-                    )
+    fields = hass.data[DOMAIN][entry.entry_id][DATA_FIELDS]
+    for field_key, field_config in fields[FieldType.BOOL]:
+        if field_config.setter is True and field_key in CONTROL_FIELDS:
+            sensors_to_add.append(
+                BluettiSwitch(
+                    bluetti_device,
+                    coordinator,
+                    coalescer,
+                    device_info,
+                    field_key,
+                    field_config.name,
+                    entry.entry_id
+                )
+            )
 
     async_add_entities(sensors_to_add)
 
 
+class _WriteCoalescer:
+    """Batch writes of all switches of a device into one connection."""
+
+    def __init__(self, coordinator: PollingCoordinator):
+        self._coordinator = coordinator
+        self._pending: list[tuple[DeviceCommand, asyncio.Future]] = []
+        self._task: asyncio.Task | None = None
+
+    async def write(self, command: DeviceCommand) -> bool:
+        """Queue command and wait until it was written."""
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((command, future))
+        if self._task is None:
+            # Tracked by Home Assistant until done, also while refreshing
+            self._task = self._coordinator.hass.async_create_background_task(
+                self._async_flush(), "bluetti_bt write"
+            )
+        return await future
+
+    async def _async_flush(self):
+        """Write all queued commands."""
+        pending: list[tuple[DeviceCommand, asyncio.Future]] | None = None
+        success = False
+        error: BaseException | None = None
+        try:
+            await asyncio.sleep(WRITE_DEBOUNCE)
+
+            reader = self._coordinator.reader
+            async with reader.polling_lock:
+                # Writes queued from now on start a new batch
+                pending, self._pending = self._pending, []
+                self._task = None
+
+                # Reuse the connection if it is still open
+                reader.cancel_idle_disconnect()
+
+                try:
+                    async with asyncio.timeout(15):
+                        await reader.async_ensure_connected()
+
+                        # Send commands
+                        for command, _ in pending:
+                            _LOGGER.debug("Requesting %s", command)
+                            await reader.client.write_gatt_char(
+                                WRITE_UUID, command.wire_bytes
+                            )
+
+                            # Wait until device has changed value, otherwise reading register might reset it.
+                            # The reader waits for this without blocking the polling lock.
+                            reader.settle(5)
+                        success = True
+
+                except TimeoutError:
+                    _LOGGER.error("Timed out for device %s", mac_loggable(reader.bluetti_device.address))
+                except BleakError as err:
+                    _LOGGER.error("Bleak error: %s", err)
+                finally:
+                    await reader.async_release_connection(success)
+
+            if success:
+                await self._coordinator.async_request_refresh()
+
+        except asyncio.CancelledError as err:
+            error = err
+            raise
+        except Exception as err:
+            # Passed on to the waiting service calls below
+            error = err
+        finally:
+            if pending is None:
+                # Stopped before the batch was taken, fail everything queued so far
+                pending, self._pending = self._pending, []
+                self._task = None
+
+            for _, future in pending:
+                if future.done():
+                    continue
+                if isinstance(error, asyncio.CancelledError):
+                    future.cancel()
+                elif error is not None:
+                    future.set_exception(error)
+                else:
+                    future.set_result(success)
+
+
 class BluettiSwitch(CoordinatorEntity, SwitchEntity):
     """Bluetti universal switch."""
 
@@ -81,8 +166,8 @@ class BluettiSwitch(CoordinatorEntity, SwitchEntity):
         self,
         bluetti_device: BluettiDevice,
         coordinator: PollingCoordinator,
+        coalescer: _WriteCoalescer,
         device_info: DeviceInfo,
-        address,
         response_key: str,
         name: str,
         entry_id: str,
@@ -92,11 +177,8 @@ class BluettiSwitch(CoordinatorEntity, SwitchEntity):
         super().__init__(coordinator)
 
         self._bluetti_device = bluetti_device
-        self._coordinator = coordinator
-        self._client = coordinator.reader.client
-        self._polling_lock = coordinator.reader.polling_lock
+        self._coalescer = coalescer
         e_name = f"{device_info.get('name')} {name}"
-        self._address = address
         self._response_key = response_key
         self._entry_id = entry_id
 
@@ -105,6 +187,8 @@ class BluettiSwitch(CoordinatorEntity, SwitchEntity):
         self._attr_name = name
         self._attr_available = False
         self._attr_unique_id = get_unique_id(e_name)
+        self._loggable_uid = unique_id_loggable(self._attr_unique_id)
+        self._written_state: tuple | None = None
         self._attr_entity_category = category
         self._attr_device_class = SwitchDeviceClass.OUTLET
 
@@ -115,10 +199,10 @@ class BluettiSwitch(CoordinatorEntity, SwitchEntity):
         if self.coordinator.reader.persistent_conn and not self.coordinator.reader.client.is_connected:
             return
 
-        _LOGGER.debug("Updating state of %s", unique_id_loggable(self._attr_unique_id))
-        if not isinstance(self.coordinator.data, dict):
+        _LOGGER.debug("Updating state of %s", self._loggable_uid)
+        if not self.coordinator.data_valid:
             _LOGGER.error(
-                "Invalid data from coordinator (switch.%s)", unique_id_loggable(self._attr_unique_id)
+                "Invalid data from coordinator (switch.%s)", self._loggable_uid
             )
             self._attr_available = False
             return
@@ -131,54 +215,34 @@ class BluettiSwitch(CoordinatorEntity, SwitchEntity):
         if not isinstance(response_data, bool):
             _LOGGER.warning(
                 "Invalid response data type from coordinator (switch.%s): %s",
-                unique_id_loggable(self._attr_unique_id),
+                self._loggable_uid,
                 response_data,
             )
             self._attr_available = False
             return
 
         self._attr_available = True
-        self._attr_is_on = self.coordinator.data[self._response_key] is True
-        self.async_write_ha_state()
+        self._attr_is_on = response_data is True
+
+        # Only write state if something changed since the last write
+        state = (self._attr_is_on, self.available)
+        if state != self._written_state:
+            self._written_state = state
+            self.async_write_ha_state()
 
     async def async_turn_on(self, **kwargs):
         """Turn the entity on."""
-        _LOGGER.debug("Turn on %s on %s", self._response_key, mac_loggable(self._address))
+        _LOGGER.debug("Turn on %s on %s", self._response_key, mac_loggable(self._bluetti_device.address))
         await self.write_to_device(True)
 
     async def async_turn_off(self, **kwargs):
         """Turn the entity off."""
-        _LOGGER.debug("Turn off %s on %s", self._response_key, mac_loggable(self._address))
+        _LOGGER.debug("Turn off %s on %s", self._response_key, mac_loggable(self._bluetti_device.address))
         await self.write_to_device(False)
 
     async def write_to_device(self, state: bool):
         """Write to device."""
         command = self._bluetti_device.build_setter_command(self._response_key, state)
 
-        async with self._polling_lock:
-            try:
-                async with async_timeout.timeout(15):
-                    if not self._client.is_connected:
-                        await self._client.connect()
-
-                    # Send command
-                    _LOGGER.debug("Requesting %s (%s,%s)", command, self._response_key, state)
-                    await self._client.write_gatt_char(
-                        WRITE_UUID, bytes(command)
-                    )
-
-                    # Wait until device has changed value, otherwise reading register might reset it
-                    await asyncio.sleep(5)
-
-            except TimeoutError:
-                _LOGGER.error("Timed out for device %s", mac_loggable(self._address))
-                return None
-            except BleakError as err:
-                _LOGGER.error("Bleak error: %s", err)
-                return None
-            finally:
-                # Disconnect if connection not persistant
-                if not self._coordinator.reader.persistent_conn:
-                    await self._client.disconnect()
-
-        await self.coordinator.async_request_refresh()
+        _LOGGER.debug("Queueing %s (%s,%s)", command, self._response_key, state)
+        await self._coalescer.write(command)
@@ -0,0 +1,34 @@
+"""Unittest for bluetti device."""
+
+import unittest
+
+from custom_components.bluetti_bt.bluetti_bt_lib.devices.ac300 import AC300
+
+
+class TestBuildSetterCommand(unittest.TestCase):
+    def test_enum_setter_cached(self):
+        device = AC300("aa:bb:cc:dd:ee:ff", "56786746478")
+        command = device.build_setter_command("ups_mode", "STANDARD")
+
+        self.assertEqual(command.address, 3001)
+        self.assertEqual(command.value, 3)
+        self.assertIs(device.build_setter_command("ups_mode", "STANDARD"), command)
+
+    def test_enum_setter_invalid_value(self):
+        device = AC300("aa:bb:cc:dd:ee:ff", "56786746478")
+        device.build_setter_command("ups_mode", "STANDARD")
+
+        with self.assertRaises(KeyError):
+            device.build_setter_command("ups_mode", 3)
+
+    def test_bool_setter_cached(self):
+        device = AC300("aa:bb:cc:dd:ee:ff", "56786746478")
+        on = device.build_setter_command("ac_output_on_switch", True)
+        off = device.build_setter_command("ac_output_on_switch", False)
+
+        self.assertEqual(on.value, 1)
+        self.assertEqual(off.value, 0)
+        self.assertIs(device.build_setter_command("ac_output_on_switch", True), on)
+
+if __name__ == '__main__':
+    unittest.main()
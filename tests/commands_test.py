@@ -0,0 +1,59 @@
+"""Unittest for device commands."""
+
+import unittest
+
+from custom_components.bluetti_bt.bluetti_bt_lib.utils.commands import (
+    MAX_READ_QUANTITY,
+    ReadHoldingRegisters,
+    merge_read_commands,
+)
+
+
+def ranges(commands):
+    return [(c.starting_address, c.quantity) for c in commands]
+
+
+class TestMergeReadCommands(unittest.TestCase):
+    def test_merge_adjacent(self):
+        merged = merge_read_commands(
+            [
+                ReadHoldingRegisters(10, 10),
+                ReadHoldingRegisters(20, 4),
+            ]
+        )
+
+        self.assertEqual(ranges(merged), [(10, 14)])
+
+    def test_merge_overlapping_unsorted(self):
+        merged = merge_read_commands(
+            [
+                ReadHoldingRegisters(3004, 2),
+                ReadHoldingRegisters(3001, 4),
+            ]
+        )
+
+        self.assertEqual(ranges(merged), [(3001, 5)])
+
+    def test_keep_gaps(self):
+        merged = merge_read_commands(
+            [
+                ReadHoldingRegisters(36, 4),
+                ReadHoldingRegisters(41, 1),
+                ReadHoldingRegisters(43, 1),
+            ]
+        )
+
+        self.assertEqual(ranges(merged), [(36, 4), (41, 1), (43, 1)])
+
+    def test_max_quantity(self):
+        merged = merge_read_commands(
+            [
+                ReadHoldingRegisters(0, MAX_READ_QUANTITY),
+                ReadHoldingRegisters(MAX_READ_QUANTITY, 1),
+            ]
+        )
+
+        self.assertEqual(ranges(merged), [(0, MAX_READ_QUANTITY), (MAX_READ_QUANTITY, 1)])
+
+if __name__ == '__main__':
+    unittest.main()